@@ -1,8 +1,242 @@
 import os
+import re
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF
 import langdetect
 from typing import Dict, Any, List, Optional
 
+# pycld3 identifies languages in C++, far faster than the pure Python langdetect
+try:
+    import cld3
+    CLD3_AVAILABLE = True
+except ImportError:
+    CLD3_AVAILABLE = False
+
+# The opening characters of a document are plenty to tell its language
+_LANGUAGE_SAMPLE_CHARS = 4096
+
+# Pages of large PDFs can be extracted in worker processes by setting
+# PDFCHAT_PAGE_WORKERS above 1. PyMuPDF pages can't be sent between processes,
+# so the workers open the file themselves and each task extracts a run of
+# consecutive pages.
+_PAGE_WORKERS = int(os.getenv("PDFCHAT_PAGE_WORKERS", "0"))
+_PARALLEL_MIN_PAGES = 8
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the shared page extraction pool, creating it on first use."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=min(_PAGE_WORKERS, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pool
+
+# PDF dates look like D:YYYYMMDDHHmmSSOHH'mm'; the timezone suffix is ignored
+_PDF_DATE_RE = re.compile(r"(?:D:)?(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})")
+
+# Format extract_image would report for an image stored with the given filter;
+# images in any other encoding come out of it as PNG
+_IMAGE_FORMATS = {
+    "DCTDecode": "jpeg",
+    "JPXDecode": "jpx",
+    "JBIG2Decode": "jb2"
+}
+
+# A text block joins the current row when its top is within _TABLE_ROW_TOLERANCE
+# points of the row's first block; two rows share their columns when their cells
+# start within _TABLE_COLUMN_TOLERANCE points of each other
+_TABLE_ROW_TOLERANCE = 3.0
+_TABLE_COLUMN_TOLERANCE = 5.0
+_TABLE_MIN_ROWS = 3
+
+def _detect_tables(raw_blocks) -> List[Dict[str, Any]]:
+    """
+    Find tables among a page's get_text("blocks") tuples: runs of at least
+    _TABLE_MIN_ROWS consecutive rows that each have two or more cells, aligned
+    with the cells of the row above.
+    """
+    # Group the text blocks into rows, top to bottom
+    rows = []
+    row_top = None
+    for block in sorted((block for block in raw_blocks if block[6] == 0), key=lambda block: block[1]):
+        if row_top is None or block[1] - row_top > _TABLE_ROW_TOLERANCE:
+            rows.append([])
+            row_top = block[1]
+        rows[-1].append(block)
+    
+    tables = []
+    run = []
+    
+    def close_run():
+        if len(run) >= _TABLE_MIN_ROWS:
+            tables.append({
+                "rows": len(run),
+                "cols": len(run[0]),
+                "cells": [
+                    [{"text": cell[4].strip(), "bbox": list(cell[:4])} for cell in row]
+                    for row in run
+                ]
+            })
+    
+    for row in rows:
+        row.sort()
+        if len(row) < 2:
+            close_run()
+            run = []
+            continue
+        
+        aligned = bool(run) and len(row) == len(run[-1]) and all(
+            abs(cell[0] - above[0]) <= _TABLE_COLUMN_TOLERANCE for cell, above in zip(row, run[-1])
+        )
+        if not aligned:
+            close_run()
+            run = []
+        run.append(row)
+    close_run()
+    return tables
+
+def _extract_page_content(page) -> Dict[str, Any]:
+    """
+    Extract the text, tables, images and blocks of a PyMuPDF page. Kept at module
+    level so that worker processes can run it.
+    """
+    try:
+        # A single layout pass gives the page's blocks as
+        # (x0, y0, x1, y1, text, block_no, block_type) tuples, images included.
+        # The text blocks joined in order are exactly page.get_text().
+        raw_blocks = page.get_text("blocks", flags=fitz.TEXTFLAGS_BLOCKS | fitz.TEXT_PRESERVE_IMAGES)
+        text = "".join(block[4] for block in raw_blocks if block[6] == 0)
+        
+        # Initialize empty collections for tables and blocks
+        tables = []
+        blocks = []
+        images = []
+        
+        # Get page blocks (structured content)
+        try:
+            for x0, y0, x1, y1, block_text, _, block_type in raw_blocks:
+                if block_type == 0:  # Text block
+                    blocks.append({
+                        "type": "text",
+                        "bbox": (x0, y0, x1, y1),
+                        "text": block_text,
+                        "font": "",  # Not always available in this format
+                        "size": 0     # Not always available in this format
+                    })
+                elif block_type == 1:  # Image block
+                    blocks.append({
+                        "type": "image",
+                        "bbox": (x0, y0, x1, y1),
+                        "text": "",
+                        "font": "",
+                        "size": 0
+                    })
+        except Exception as e:
+            print(f"Error extracting blocks: {str(e)}")
+        
+        # Describe the page's images from the image list alone. Each entry is
+        # (xref, smask, width, height, bpc, colorspace, alt_colorspace, name,
+        # filter, referencer), so the image streams are never decoded.
+        try:
+            image_list = page.get_images(full=True)
+            for img_idx, img_info in enumerate(image_list):
+                try:
+                    width, height, image_filter = img_info[2], img_info[3], img_info[8]
+                    images.append({
+                        "index": img_idx,
+                        "width": width,
+                        "height": height,
+                        "format": _IMAGE_FORMATS.get(image_filter, "png"),
+                        "data": None  # Not storing binary data here
+                    })
+                except Exception as img_err:
+                    print(f"Error extracting image {img_idx}: {str(img_err)}")
+        except Exception as e:
+            print(f"Error processing images: {str(e)}")
+        
+        # Detect tables from the layout of the text blocks
+        try:
+            tables = _detect_tables(raw_blocks)
+        except Exception as e:
+            print(f"Error detecting tables: {str(e)}")
+        
+        # Return the extracted information
+        return {
+            "text": text,
+            "tables": tables,
+            "images": images,
+            "blocks": blocks
+        }
+    except Exception as e:
+        print(f"Error processing page: {str(e)}")
+        return {
+            "text": "",
+            "tables": [],
+            "images": [],
+            "blocks": []
+        }
+
+# The document a page worker opened last, as ((path, mtime, size), document). The
+# tasks for one PDF arrive back to back, so each worker parses the file once. The
+# task for the last pages closes it, and any other worker closes it after
+# _WORKER_DOCUMENT_IDLE_SECONDS without a task, so an open handle never keeps a
+# deleted upload on disk (or, on Windows, locked) beyond the request.
+_WORKER_DOCUMENT_IDLE_SECONDS = 5.0
+_worker_document = None
+_worker_document_timer = None
+_worker_document_lock = threading.Lock()
+
+def _open_worker_document(file_path: str):
+    """Return the PDF opened in this worker process, reopening it if the file changed."""
+    global _worker_document
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    if _worker_document is None or _worker_document[0] != key:
+        _close_worker_document()
+        _worker_document = (key, fitz.open(file_path))
+    return _worker_document[1]
+
+def _close_worker_document() -> None:
+    """Close the PDF held open by this worker process, if any."""
+    global _worker_document
+    if _worker_document is not None:
+        _worker_document[1].close()
+        _worker_document = None
+
+def _close_idle_worker_document() -> None:
+    """Timer callback closing the worker's PDF once no task has used it for a while."""
+    with _worker_document_lock:
+        _close_worker_document()
+
+def _process_pages_worker(file_path: str, first_page: int, last_page: int) -> List[Dict[str, Any]]:
+    """Extract pages first_page to last_page - 1 of a PDF in a worker process."""
+    global _worker_document_timer
+    with _worker_document_lock:
+        if _worker_document_timer is not None:
+            _worker_document_timer.cancel()
+            _worker_document_timer = None
+        pdf_document = _open_worker_document(file_path)
+        try:
+            pages = [_extract_page_content(pdf_document[page_num])
+                     for page_num in range(first_page, last_page)]
+        finally:
+            if last_page >= len(pdf_document):
+                _close_worker_document()
+            else:
+                _worker_document_timer = threading.Timer(_WORKER_DOCUMENT_IDLE_SECONDS,
+                                                         _close_idle_worker_document)
+                _worker_document_timer.daemon = True
+                _worker_document_timer.start()
+    return pages
+
 class DocumentProcessor:
     """
     Handles the processing of various document types, extracting text, metadata,
@@ -23,27 +257,35 @@ class DocumentProcessor:
         try:
             if not date_string or not isinstance(date_string, str):
                 return ""
-                
-            # Remove 'D:' prefix if present
-            if date_string.startswith('D:'):
-                date_string = date_string[2:]
-                
-            # Extract basic components
-            if len(date_string) >= 14:
-                year = date_string[0:4]
-                month = date_string[4:6]
-                day = date_string[6:8]
-                hour = date_string[8:10]
-                minute = date_string[10:12]
-                second = date_string[12:14]
-                
-                return f"{year}-{month}-{day} {hour}:{minute}:{second}"
-            else:
-                return date_string  # Return as is if format not recognized
+            
+            match = _PDF_DATE_RE.match(date_string)
+            if match:
+                return f"{match[1]}-{match[2]}-{match[3]} {match[4]}:{match[5]}:{match[6]}"
+            
+            # Return as is, without the 'D:' prefix, if the format is not recognized
+            return date_string[2:] if date_string.startswith('D:') else date_string
         except Exception as e:
             print(f"Error formatting PDF date: {str(e)}")
             return date_string  # Return original on error
     
+    @staticmethod
+    def detect_language(text: str) -> str:
+        """
+        Detect the language of a document from its first _LANGUAGE_SAMPLE_CHARS
+        characters, with pycld3 when installed and langdetect otherwise.
+        
+        Args:
+            text: The document text
+            
+        Returns:
+            ISO 639-1 language code, "en" when cld3 can't tell reliably
+        """
+        sample = text[:_LANGUAGE_SAMPLE_CHARS]
+        if CLD3_AVAILABLE:
+            prediction = cld3.get_language(sample)
+            return prediction.language if prediction and prediction.is_reliable else "en"
+        return langdetect.detect(sample)
+    
     @staticmethod
     async def process_page(page) -> Dict[str, Any]:
         """
@@ -55,98 +297,29 @@ class DocumentProcessor:
         Returns:
             Dict with page content, tables, images, and other extracted information
         """
+        return _extract_page_content(page)
+    
+    @staticmethod
+    async def _process_pages_in_workers(file_path: str, page_count: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract every page of a PDF in the page worker pool, a run of consecutive
+        pages per task. Returns None if the workers fail, so the caller can fall
+        back to extracting the pages here.
+        """
         try:
-            # Extract text from the page
-            text = page.get_text()
-            
-            # Initialize empty collections for tables and blocks
-            tables = []
-            blocks = []
-            images = []
-            
-            # Get page blocks (structured content)
-            try:
-                # Extract blocks from the page - using the appropriate PyMuPDF methods
-                for block in page.get_text("dict")["blocks"]:
-                    if block["type"] == 0:  # Text block
-                        blocks.append({
-                            "type": "text",
-                            "bbox": block["bbox"],
-                            "text": block.get("text", ""),
-                            "font": "",  # Not always available in this format
-                            "size": 0     # Not always available in this format
-                        })
-                    elif block["type"] == 1:  # Image block
-                        blocks.append({
-                            "type": "image",
-                            "bbox": block["bbox"],
-                            "text": "",
-                            "font": "",
-                            "size": 0
-                        })
-            except Exception as e:
-                print(f"Error extracting blocks: {str(e)}")
-            
-            # Extract images if available
-            try:
-                image_list = page.get_images(full=True)
-                for img_idx, img_info in enumerate(image_list):
-                    try:
-                        xref = img_info[0]  # Cross-reference number
-                        base_image = page.parent.extract_image(xref)
-                        if base_image:
-                            image_data = {
-                                "index": img_idx,
-                                "width": base_image.get("width", 0),
-                                "height": base_image.get("height", 0),
-                                "format": base_image.get("ext", ""),
-                                "data": None  # Not storing binary data here
-                            }
-                            images.append(image_data)
-                    except Exception as img_err:
-                        print(f"Error extracting image {img_idx}: {str(img_err)}")
-            except Exception as e:
-                print(f"Error processing images: {str(e)}")
-            
-            # For tables, we would need a table detection algorithm
-            # This is a simplified approach - looking for content that might be tables
-            # based on layout and structure
-            try:
-                # A simple heuristic for detecting potential tables
-                # This is a placeholder and not a real table detection
-                potential_tables = []
-                
-                # In a real implementation, we would use a more sophisticated 
-                # table detection algorithm here
-                
-                # For now, just add dummy example
-                if len(text) > 200 and '|' in text:
-                    # Simple heuristic: text contains pipe characters might be a table
-                    lines = [line for line in text.split('\n') if '|' in line]
-                    if len(lines) > 2:  # At least a header and one data row
-                        table_data = []
-                        for line in lines:
-                            row = [cell.strip() for cell in line.split('|')]
-                            table_data.append(row)
-                        tables.append(table_data)
-            except Exception as e:
-                print(f"Error detecting tables: {str(e)}")
-            
-            # Return the extracted information
-            return {
-                "text": text,
-                "tables": tables,
-                "images": images,
-                "blocks": blocks
-            }
+            workers = min(_PAGE_WORKERS, os.cpu_count() or 1, page_count)
+            chunksize = max(1, -(-page_count // (workers * 4)))
+            loop = asyncio.get_running_loop()
+            pool = _get_page_pool()
+            chunks = await asyncio.gather(*[
+                loop.run_in_executor(pool, _process_pages_worker, file_path, first_page,
+                                     min(first_page + chunksize, page_count))
+                for first_page in range(0, page_count, chunksize)
+            ])
+            return [page_content for chunk in chunks for page_content in chunk]
         except Exception as e:
-            print(f"Error processing page: {str(e)}")
-            return {
-                "text": "",
-                "tables": [],
-                "images": [],
-                "blocks": []
-            }
+            print(f"Parallel page extraction failed, extracting pages serially: {str(e)}")
+            return None
     
     @staticmethod
     async def extract_pdf_metadata(pdf_document) -> Dict[str, Any]:
@@ -239,15 +412,22 @@ class DocumentProcessor:
             # Extract metadata
             result["metadata"] = await DocumentProcessor.extract_pdf_metadata(pdf_document)
             
-            # Process each page
-            full_text = ""
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                page_content = await DocumentProcessor.process_page(page)
-                
+            # Process each page, in worker processes for large documents when enabled
+            page_count = len(pdf_document)
+            page_contents = None
+            if _PAGE_WORKERS > 1 and page_count >= _PARALLEL_MIN_PAGES:
+                page_contents = await DocumentProcessor._process_pages_in_workers(file_path, page_count)
+            if page_contents is None:
+                page_contents = [
+                    await DocumentProcessor.process_page(pdf_document[page_num])
+                    for page_num in range(page_count)
+                ]
+            
+            full_text_parts = []
+            for page_num, page_content in enumerate(page_contents):
                 # Add page text to full document text
                 if page_content.get("text"):
-                    full_text += page_content["text"] + "\n\n"
+                    full_text_parts.append(page_content["text"])
                 
                 # Add page to results
                 result["pages"].append({
@@ -270,12 +450,13 @@ class DocumentProcessor:
                     })
             
             # Store the full text
-            result["content"] = full_text.strip()
+            full_text = "\n\n".join(full_text_parts).strip()
+            result["content"] = full_text
             
             # Detect language if text available
-            if full_text.strip():
+            if full_text:
                 try:
-                    result["language"] = langdetect.detect(full_text)
+                    result["language"] = DocumentProcessor.detect_language(full_text)
                 except Exception as e:
                     print(f"Language detection error: {str(e)}")
                     result["language"] = "en"  # Default to English
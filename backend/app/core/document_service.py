@@ -9,12 +9,21 @@ import json
 import re
 import time
 
-from .document_parser import DocumentParser
+from .document_parser import get_document_parser
 from ..schemas import DocumentAnalysis, AnalysisResult
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Read size used when hashing uploads for the cache key.
+_CACHE_KEY_CHUNK_SIZE = 1 << 20
+
 class DocumentService:
     def __init__(self):
-        self.parser = DocumentParser()
+        self.parser = get_document_parser()
         self.upload_dir = "uploads"
         self.cache_dir = "cache"
         self._ensure_directories()
@@ -92,10 +101,20 @@ class DocumentService:
     def _generate_cache_key(self, file_path: str) -> str:
         """
         Generate a cache key based on file content.
-        """
+
+        Keys are xxh64 digests streamed in 1 MiB chunks; the ``xxh64_``
+        prefix keeps them apart from older SHA-256 keyed cache entries.
+        """
+        if XXHASH_AVAILABLE:
+            digest = xxhash.xxh64()
+            prefix = "xxh64_"
+        else:
+            digest = hashlib.sha256()
+            prefix = ""
         with open(file_path, 'rb') as f:
-            content = f.read()
-            return hashlib.sha256(content).hexdigest()
+            while chunk := f.read(_CACHE_KEY_CHUNK_SIZE):
+                digest.update(chunk)
+        return prefix + digest.hexdigest()
     
     async def _analyze_document(self, file_path: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,164 @@
+import re
+import pytest
+from ..core import document_parser
+from ..core.document_parser import DocumentParser
+
+@pytest.fixture(scope="module")
+def parser():
+    """A parser without models; the helpers under test only use module-level tables."""
+    return DocumentParser.__new__(DocumentParser)
+
+def _uncached(step):
+    # The undecorated helper, so that results never come from the content-hash cache
+    method = getattr(DocumentParser, step)
+    return getattr(method, "__wrapped__", method)
+
+def test_compliance_contexts_bracket_the_match_after_non_ascii_prefix(parser):
+    """Lowercasing "İ" adds a code point; the bracketed text must still be the match."""
+    text = (
+        "İSTANBUL İİİİ İİİİ\n\n"
+        "This agreement between the parties shall be governed by the law of the State of New York. "
+        "Force majeure applies."
+    )
+
+    result = _uncached("_check_compliance")(parser, text)
+
+    area = result["detailed_results"]["Contract Completeness"]
+    patterns = {
+        requirement["name"]: requirement["pattern"]
+        for requirement in document_parser._COMPLIANCE_AREAS["Contract Completeness"]["requirements"]
+    }
+    assert "Force Majeure" in area["requirements_contexts"]
+    for name, contexts in area["requirements_contexts"].items():
+        for context in contexts:
+            bracketed = re.search(r'\[([^\]]*)\]', context).group(1)
+            assert patterns[name].fullmatch(bracketed.lower()), (name, context)
+
+class _Model:
+    def __init__(self, label):
+        self.label = label
+
+class _ModelUser:
+    def __init__(self, label):
+        self.model = _Model(label)
+        self.calls = 0
+
+    @document_parser._cached_by_content_hash(maxsize=4, model_attr="model")
+    def describe(self, text):
+        self.calls += 1
+        return [self.model.label, text]
+
+def test_content_hash_cache_is_keyed_by_model():
+    """A parser on a fallback model doesn't hand its results to one with the real model."""
+    mock, real = _ModelUser("mock"), _ModelUser("real")
+
+    assert mock.describe("same text") == ["mock", "same text"]
+    assert real.describe("same text") == ["real", "same text"]
+    assert real.describe("same text") == ["real", "same text"]
+    assert (mock.calls, real.calls) == (1, 1)
+
+class _RecordingSummarizer:
+    def __init__(self):
+        self.chunks = None
+
+    def __call__(self, chunks, **kwargs):
+        self.chunks = chunks
+        return [{"summary_text": f"s{i}"} for i in range(len(chunks))]
+
+def test_summary_chunks_are_bounded_and_skip_a_short_tail():
+    """Only the first _SUMMARY_MAX_CHUNKS chunks are built, and a short tail is dropped."""
+    chunk_words = document_parser._SUMMARY_CHUNK_WORDS
+    summary_parser = DocumentParser.__new__(DocumentParser)
+    summary_parser.summarizer = _RecordingSummarizer()
+
+    long_text = " ".join(["word"] * (chunk_words * (document_parser._SUMMARY_MAX_CHUNKS + 3)))
+    _uncached("_generate_summary")(summary_parser, long_text)
+    assert len(summary_parser.summarizer.chunks) == document_parser._SUMMARY_MAX_CHUNKS
+
+    tail_text = " ".join(["word"] * (chunk_words + 5))
+    assert _uncached("_generate_summary")(summary_parser, tail_text) == "s0"
+    assert len(summary_parser.summarizer.chunks) == 1
+
+    exact_text = " ".join(["word"] * (chunk_words * 2))
+    _uncached("_generate_summary")(summary_parser, exact_text)
+    assert len(summary_parser.summarizer.chunks) == 2
+
+def test_readability_counts_words_of_the_lowercased_text(parser):
+    """"İ" lowercases to "i" plus a combining dot, which splits the word."""
+    result = _uncached("_calculate_readability")(parser, "İstanbul is a city.")
+
+    assert result["word_count"] == 5
+
+class _Counter:
+    def __init__(self):
+        self.calls = 0
+
+    @document_parser._cached_by_content_hash(maxsize=4)
+    def items(self, text):
+        self.calls += 1
+        return {"words": text.split()}
+
+def test_content_hash_cache_returns_copies():
+    """Mutating a cached result doesn't change what later callers get."""
+    counter = _Counter()
+
+    first = counter.items("alpha beta")
+    first["words"].append("gamma")
+
+    assert counter.items("alpha beta") == {"words": ["alpha", "beta"]}
+    assert counter.calls == 1
+
+def test_sentiment_scores_non_empty_text(parser):
+    """The entropy step used math.log2 without importing math, failing every document."""
+    text = (
+        "The service is excellent and the support team is helpful.\n\n"
+        "Late payments will incur a penalty and repeated breach leads to termination.\n\n"
+        "The parties agree to cooperate in good faith."
+    )
+
+    result = _uncached("_analyze_sentiment")(parser, text)
+
+    assert not result["summary"].startswith("Error occurred")
+    assert "visualization" in result
+
+def test_section_splitter_chunks_unstructured_text(parser):
+    """Text without headings or paragraphs falls back to word chunks."""
+    text = " ".join(f"word{i}" for i in range(120))
+
+    sections = parser._split_text_into_sections(text)
+
+    assert [len(section.split()) for section in sections] == [50, 50, 20]
+
+def test_topics_without_category_terms_still_report_keywords(parser):
+    """A document with no category term used to hit a NameError and return nothing."""
+    text = "Every zebrafish enjoys water and every zebrafish swims quickly. " * 4
+
+    topics = _uncached("_extract_topics")(parser, text)
+
+    assert any(topic["topic"] == "Zebrafish" and topic["type"] == "keyword" for topic in topics)
+
+def test_key_phrases_keep_first_seen_phrases_tied_at_the_cutoff(parser):
+    """Among phrases tied at the 15th-place score, the earliest seen are kept."""
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+             "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa"]
+    # Every 2 and 3 word phrase scores the same and ranks above the 1 and 4 word ones
+    expected = []
+    for i in range(len(words)):
+        expected.extend(" ".join(words[i:i + n]) for n in (2, 3) if i + n <= len(words))
+
+    phrases = parser._extract_key_phrases(" ".join(words))
+
+    assert [phrase["phrase"] for phrase in phrases] == [phrase.title() for phrase in expected[:15]]
+
+def test_key_clauses_wait_for_earlier_clauses_raised_to_the_cap(parser):
+    """A duplicate can raise an earlier clause to the cap, ahead of later capped ones."""
+    indemnity = ("The Customer shall indemnify the Supplier against every third party claim that "
+                 "arises from the use of the delivered software by its staff")
+    liability = [f"Clause {i}: in no event shall the Supplier be liable for losses above {i} thousand dollars."
+                 for i in range(1, 11)]
+    text = "\n\n".join([indemnity + ". Nothing further."] + liability + [indemnity + ". SEE SCHEDULE NOTE."])
+
+    clauses = _uncached("_extract_key_clauses")(parser, text)
+
+    assert [clause["content"] for clause in clauses] == [indemnity + ". Nothing further."] + liability[:9]
+    assert clauses[0]["importance"] == 0.95
@@ -0,0 +1,42 @@
+import pytest
+from ..core.document_processing import DocumentProcessor, _extract_page_content
+
+@pytest.mark.parametrize("date_string, expected", [
+    ("D:20230115103000+05'00'", "2023-01-15 10:30:00"),
+    ("20230115103000Z", "2023-01-15 10:30:00"),
+    ("D:2023", "2023"),
+    ("Not a date string at all", "Not a date string at all"),
+    ("", ""),
+])
+def test_format_pdf_date(date_string, expected):
+    """Well-formed dates are reformatted; anything else comes back without the D: prefix."""
+    assert DocumentProcessor.format_pdf_date(date_string) == expected
+
+class _FakePage:
+    """Stands in for a PyMuPDF page, returning fixed get_text("blocks") tuples."""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def get_text(self, option, flags=0):
+        return self.blocks
+
+    def get_images(self, full=False):
+        return []
+
+def test_page_tables_merge_into_page_results():
+    """Tables are dicts, so process_pdf can merge them with {"page": ..., **table}."""
+    blocks = [
+        (72.0, 100.0, 150.0, 112.0, "| Item |\n", 0, 0),
+        (200.0, 100.0, 280.0, 112.0, "| Amount |\n", 1, 0),
+        (72.0, 120.0, 150.0, 132.0, "| Setup |\n", 2, 0),
+        (200.0, 120.0, 280.0, 132.0, "| 1,000 |\n", 3, 0),
+        (72.0, 140.0, 150.0, 152.0, "| Support |\n", 4, 0),
+        (200.0, 140.0, 280.0, 152.0, "| 500 |\n", 5, 0),
+    ]
+
+    page_content = _extract_page_content(_FakePage(blocks))
+
+    merged = [{"page": 1, **table} for table in page_content["tables"]]
+    assert [(table["page"], table["rows"], table["cols"]) for table in merged] == [(1, 3, 2)]
+    assert page_content["text"].startswith("| Item |\n| Amount |")
@@ -0,0 +1,28 @@
+import hashlib
+import pytest
+from ..core import document_service
+from ..core.document_service import DocumentService
+
+@pytest.fixture
+def upload(tmp_path):
+    path = tmp_path / "upload.pdf"
+    path.write_bytes(b"%PDF-1.4 " + bytes(range(256)) * 40)
+    return path
+
+def _cache_key(path):
+    # The key only depends on the file, so the service is created without a parser
+    return DocumentService.__new__(DocumentService)._generate_cache_key(str(path))
+
+def test_cache_key_is_prefixed_xxh64(upload, monkeypatch):
+    """xxh64 keys are streamed in chunks and prefixed to keep them apart from SHA-256 ones."""
+    xxhash = pytest.importorskip("xxhash")
+    monkeypatch.setattr(document_service, "_CACHE_KEY_CHUNK_SIZE", 1000)
+
+    assert _cache_key(upload) == "xxh64_" + xxhash.xxh64(upload.read_bytes()).hexdigest()
+
+def test_cache_key_falls_back_to_sha256(upload, monkeypatch):
+    """Without xxhash the key is the plain SHA-256 digest used by existing cache entries."""
+    monkeypatch.setattr(document_service, "XXHASH_AVAILABLE", False)
+    monkeypatch.setattr(document_service, "_CACHE_KEY_CHUNK_SIZE", 1000)
+
+    assert _cache_key(upload) == hashlib.sha256(upload.read_bytes()).hexdigest()
@@ -0,0 +1,136 @@
+import pytest
+from ..core import document_parser
+from ..core.document_parser import DocumentParser
+from ..core.document_processing import _detect_tables
+
+# The analysis helpers use Hyperscan, Aho-Corasick and Numba when they are
+# installed and fall back to regexes and NumPy otherwise; both must give the
+# same results, including for text that is not plain ASCII.
+CONTRACT_TEXT = """SERVICE AGREEMENT
+
+1. Definitions. "Personal Data" shall mean any information relating to an identified
+or identifiable natural person, as defined under the GDPR and the CCPA.
+
+2. Confidentiality. The Receiving Party shall keep all Confidential Information
+strictly confidential and shall not disclose it to any third party without the
+prior written consent of the Disclosing Party.
+
+3. Limitation of Liability. Under no circumstances shall the Provider be liable for
+any indirect, incidental or consequential damages. The services are provided as is,
+and the Provider is not responsible for any damages arising from their use.
+
+4. Termination. Either party may terminate this Agreement upon thirty (30) days
+written notice. The Provider may terminate immediately in its sole discretion.
+
+5. Indemnification. The Customer shall indemnify and hold harmless the Provider
+against all claims, losses and liabilities arising from a breach of this Agreement.
+
+6. Governing Law. This Agreement shall be governed by the laws of the State of
+New York, and any dispute shall be resolved by binding arbitration.
+
+7. Data Protection. The Processor shall implement appropriate technical and
+organisational security measures, notify the Controller of any data breach within
+72 hours, and honour data subject requests for access, erasure and portability.
+"""
+
+NON_ASCII_TEXT = """CONTRAT DE SERVICE – Société Générale and Müller GmbH
+
+1. Confidentialité. The Recipient shall keep the Confidential Information of
+Müller GmbH confidential and shall not disclose it to any third party; naïve
+disclosure to a café or résumé service is a material breach.
+
+2. Responsabilité. Under no circumstances shall the Supplier be liable for
+consequential damages or loss of profits exceeding € 10 000.
+
+3. The parties agree that the ﬁduciary duties of the ﬁrm and all ﬂoating
+charges survive termination of this Agreement; the Licensee shall indemnify the
+Licensor against claims under the GDPR.
+"""
+
+SEPARATOR_TEXT = (
+    "1. Termination.\x1cEither party may terminate this Agreement\x1con notice.\n\n"
+    "2. Liability.\x1dThe Provider shall not be liable\x1efor indirect damages\x1fand "
+    "disclaims all warranties as is.\n\n"
+    "3. Privacy. Personal data shall be processed under the GDPR\x1cand the CCPA."
+)
+
+TEXTS = {
+    "contract": CONTRACT_TEXT,
+    "non_ascii": NON_ASCII_TEXT,
+    "separators": SEPARATOR_TEXT,
+}
+
+STEPS = [
+    "_extract_topics",
+    "_extract_legal_terms",
+    "_check_compliance",
+    "_extract_key_clauses",
+    "_calculate_readability",
+]
+
+@pytest.fixture(scope="module")
+def parser():
+    """A parser without models; the helpers under test only use module-level tables."""
+    return DocumentParser.__new__(DocumentParser)
+
+def _run_step(parser, step, text):
+    # Call the undecorated helper so that results never come from the cache
+    method = getattr(DocumentParser, step)
+    return getattr(method, "__wrapped__", method)(parser, text)
+
+@pytest.mark.parametrize("step", STEPS)
+@pytest.mark.parametrize("name", sorted(TEXTS))
+def test_fast_paths_match_fallbacks(parser, monkeypatch, step, name):
+    """Results with the optional accelerators match the pure Python fallbacks."""
+    text = TEXTS[name]
+    fast = _run_step(parser, step, text)
+
+    monkeypatch.setattr(document_parser, "HYPERSCAN_AVAILABLE", False)
+    monkeypatch.setattr(document_parser, "AHOCORASICK_AVAILABLE", False)
+    monkeypatch.setattr(document_parser, "NUMBA_AVAILABLE", False)
+    fallback = _run_step(parser, step, text)
+
+    assert fast == fallback
+
+def _block(x0, y0, text, block_no, block_type=0):
+    return (x0, y0, x0 + 80.0, y0 + 12.0, text, block_no, block_type)
+
+def test_detect_tables():
+    """Aligned rows of two or more cells are reported as one table."""
+    blocks = [
+        _block(72.0, 50.0, "Payment Schedule\n", 0),
+        _block(72.0, 100.0, "Item\n", 1),
+        _block(200.0, 101.0, "Amount\n", 2),
+        _block(72.0, 120.0, "Setup\n", 3),
+        _block(201.5, 120.5, "1,000\n", 4),
+        _block(73.0, 140.0, "Support\n", 5),
+        _block(200.0, 140.0, "500\n", 6),
+        _block(72.0, 160.0, "image", 7, block_type=1),
+        _block(72.0, 200.0, "Signed by both parties.\n", 8),
+    ]
+
+    tables = _detect_tables(blocks)
+
+    assert len(tables) == 1
+    table = tables[0]
+    assert table["rows"] == 3
+    assert table["cols"] == 2
+    assert [[cell["text"] for cell in row] for row in table["cells"]] == [
+        ["Item", "Amount"],
+        ["Setup", "1,000"],
+        ["Support", "500"],
+    ]
+    assert table["cells"][1][1]["bbox"] == [201.5, 120.5, 281.5, 132.5]
+
+def test_detect_tables_needs_aligned_rows():
+    """Rows whose cells don't line up, or too few rows, are not a table."""
+    blocks = [
+        _block(72.0, 100.0, "Item\n", 0),
+        _block(200.0, 100.0, "Amount\n", 1),
+        _block(72.0, 120.0, "Setup\n", 2),
+        _block(260.0, 120.0, "1,000\n", 3),
+        _block(72.0, 140.0, "Support\n", 4),
+        _block(260.0, 140.0, "500\n", 5),
+    ]
+
+    assert _detect_tables(blocks) == []